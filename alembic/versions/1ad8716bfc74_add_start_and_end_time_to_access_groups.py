@@ -52,10 +52,20 @@ sqlite_reflect_kwargs = {
 
 
 def upgrade():
-    op.add_column('access_group', sa.Column('start_time', residue.UTCDateTime(), nullable=True))
-    op.add_column('access_group', sa.Column('end_time', residue.UTCDateTime(), nullable=True))
+    if is_sqlite:
+        with op.batch_alter_table('access_group', reflect_kwargs=sqlite_reflect_kwargs) as batch_op:
+            batch_op.add_column(sa.Column('start_time', residue.UTCDateTime(), nullable=True))
+            batch_op.add_column(sa.Column('end_time', residue.UTCDateTime(), nullable=True))
+    else:
+        op.add_column('access_group', sa.Column('start_time', residue.UTCDateTime(), nullable=True))
+        op.add_column('access_group', sa.Column('end_time', residue.UTCDateTime(), nullable=True))
 
 
 def downgrade():
-    op.drop_column('access_group', 'start_time')
-    op.drop_column('access_group', 'end_time')
+    if is_sqlite:
+        with op.batch_alter_table('access_group', reflect_kwargs=sqlite_reflect_kwargs) as batch_op:
+            batch_op.drop_column('start_time')
+            batch_op.drop_column('end_time')
+    else:
+        op.drop_column('access_group', 'start_time')
+        op.drop_column('access_group', 'end_time')
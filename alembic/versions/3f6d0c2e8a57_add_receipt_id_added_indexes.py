@@ -0,0 +1,62 @@
+"""Add receipt_id, added indexes on receipt transactions and items
+
+Revision ID: 3f6d0c2e8a57
+Revises: 8b2e4f7a91c3
+Create Date: 2026-10-15 10:04:17.502694
+
+"""
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6d0c2e8a57'
+down_revision = '8b2e4f7a91c3'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+try:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+except Exception:
+    is_sqlite = False
+
+if is_sqlite:
+    op.get_context().connection.execute('PRAGMA foreign_keys=ON;')
+    utcnow_server_default = "(datetime('now', 'utc'))"
+else:
+    utcnow_server_default = "timezone('utc', current_timestamp)"
+
+def sqlite_column_reflect_listener(inspector, table, column_info):
+    """Adds parenthesis around SQLite datetime defaults for utcnow."""
+    if column_info['default'] == "datetime('now', 'utc')":
+        column_info['default'] = utcnow_server_default
+
+sqlite_reflect_kwargs = {
+    'listeners': [('column_reflect', sqlite_column_reflect_listener)]
+}
+
+# ===========================================================================
+# HOWTO: Handle alter statements in SQLite
+#
+# def upgrade():
+#     if is_sqlite:
+#         with op.batch_alter_table('table_name', reflect_kwargs=sqlite_reflect_kwargs) as batch_op:
+#             batch_op.alter_column('column_name', type_=sa.Unicode(), server_default='', nullable=False)
+#     else:
+#         op.alter_column('table_name', 'column_name', type_=sa.Unicode(), server_default='', nullable=False)
+#
+# ===========================================================================
+
+
+def upgrade():
+    op.create_index('ix_receipt_transaction_receipt_id_added', 'receipt_transaction', ['receipt_id', 'added'],
+                    unique=False)
+    op.create_index('ix_receipt_item_receipt_id_added', 'receipt_item', ['receipt_id', 'added'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_receipt_item_receipt_id_added', table_name='receipt_item')
+    op.drop_index('ix_receipt_transaction_receipt_id_added', table_name='receipt_transaction')
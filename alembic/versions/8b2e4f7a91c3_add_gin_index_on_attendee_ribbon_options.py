@@ -0,0 +1,63 @@
+"""Add GIN index on attendee ribbon options
+
+Revision ID: 8b2e4f7a91c3
+Revises: 7c43e4352bb0
+Create Date: 2026-10-15 09:12:41.118230
+
+"""
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4f7a91c3'
+down_revision = '7c43e4352bb0'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+try:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+except Exception:
+    is_sqlite = False
+
+if is_sqlite:
+    op.get_context().connection.execute('PRAGMA foreign_keys=ON;')
+    utcnow_server_default = "(datetime('now', 'utc'))"
+else:
+    utcnow_server_default = "timezone('utc', current_timestamp)"
+
+def sqlite_column_reflect_listener(inspector, table, column_info):
+    """Adds parenthesis around SQLite datetime defaults for utcnow."""
+    if column_info['default'] == "datetime('now', 'utc')":
+        column_info['default'] = utcnow_server_default
+
+sqlite_reflect_kwargs = {
+    'listeners': [('column_reflect', sqlite_column_reflect_listener)]
+}
+
+# ===========================================================================
+# HOWTO: Handle alter statements in SQLite
+#
+# def upgrade():
+#     if is_sqlite:
+#         with op.batch_alter_table('table_name', reflect_kwargs=sqlite_reflect_kwargs) as batch_op:
+#             batch_op.alter_column('column_name', type_=sa.Unicode(), server_default='', nullable=False)
+#     else:
+#         op.alter_column('table_name', 'column_name', type_=sa.Unicode(), server_default='', nullable=False)
+#
+# ===========================================================================
+
+
+def upgrade():
+    # SQLite has no array type, so has_opt() falls back to a LIKE match there
+    if not is_sqlite:
+        op.create_index('ix_attendee_ribbon_opts', 'attendee', [sa.text("string_to_array(ribbon, ',')")],
+                        unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if not is_sqlite:
+        op.drop_index('ix_attendee_ribbon_opts', table_name='attendee')
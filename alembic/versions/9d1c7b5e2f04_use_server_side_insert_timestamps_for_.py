@@ -0,0 +1,79 @@
+"""Use server-side insert timestamps for commerce log tables
+
+Revision ID: 9d1c7b5e2f04
+Revises: 3f6d0c2e8a57
+Create Date: 2026-10-15 10:41:52.836120
+
+"""
+
+
+# revision identifiers, used by Alembic.
+revision = '9d1c7b5e2f04'
+down_revision = '3f6d0c2e8a57'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+import residue
+
+
+
+try:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+except Exception:
+    is_sqlite = False
+
+if is_sqlite:
+    op.get_context().connection.execute('PRAGMA foreign_keys=ON;')
+    utcnow_server_default = "(datetime('now', 'utc'))"
+else:
+    utcnow_server_default = "timezone('utc', current_timestamp)"
+
+def sqlite_column_reflect_listener(inspector, table, column_info):
+    """Adds parenthesis around SQLite datetime defaults for utcnow."""
+    if column_info['default'] == "datetime('now', 'utc')":
+        column_info['default'] = utcnow_server_default
+
+sqlite_reflect_kwargs = {
+    'listeners': [('column_reflect', sqlite_column_reflect_listener)]
+}
+
+# ===========================================================================
+# HOWTO: Handle alter statements in SQLite
+#
+# def upgrade():
+#     if is_sqlite:
+#         with op.batch_alter_table('table_name', reflect_kwargs=sqlite_reflect_kwargs) as batch_op:
+#             batch_op.alter_column('column_name', type_=sa.Unicode(), server_default='', nullable=False)
+#     else:
+#         op.alter_column('table_name', 'column_name', type_=sa.Unicode(), server_default='', nullable=False)
+#
+# ===========================================================================
+
+
+timestamp_columns = [
+    ('arbitrary_charge', 'when'),
+    ('m_points_for_cash', 'when'),
+    ('old_m_point_exchange', 'when'),
+    ('sale', 'when'),
+    ('terminal_settlement', 'requested'),
+]
+
+
+def set_server_default(server_default):
+    for table_name, column_name in timestamp_columns:
+        if is_sqlite:
+            with op.batch_alter_table(table_name, reflect_kwargs=sqlite_reflect_kwargs) as batch_op:
+                batch_op.alter_column(column_name, existing_type=residue.UTCDateTime(), server_default=server_default)
+        else:
+            op.alter_column(table_name, column_name, existing_type=residue.UTCDateTime(),
+                            server_default=server_default)
+
+
+def upgrade():
+    set_server_default(sa.text(utcnow_server_default))
+
+
+def downgrade():
+    set_server_default(None)
@@ -4,12 +4,15 @@ import pytest
 import pytz
 from mock import Mock
 from pytz import UTC
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 
 from uber import config
 from uber.config import c
 from uber.models import Attendee, Department, DeptMembership, DeptMembershipRequest, DeptRole, FoodRestrictions, \
     Group, Job, Session, Shift
 from uber.model_checks import invalid_phone_number
+from uber.models.types import has_opt
 
 
 @pytest.fixture()
@@ -838,11 +841,64 @@ class TestPhoneNumberValidations:
         '404\\404 4040',
         # normally a valid US number, but we want the area code
         '123-4567',
+        # US area codes can't start with 0 or 1
+        '123-456-7890',
+        '(023) 456-7890',
 
         # invalid international numbers
         '+1234567890',
         '+41458d98e5',
-        '+44,4930222'
+        '+44,4930222',
+
+        # missing numbers
+        '',
+        None
     ])
     def test_invalid_number(selfself, number):
         assert invalid_phone_number(number)
+
+
+class TestHasOpt:
+    ribbons = ['123', '1234', '123,456', '456', '']
+
+    @pytest.fixture
+    def session(self):
+        with Session() as session:
+            for ribbon in self.ribbons:
+                session.add(Attendee(placeholder=True, first_name='Has', last_name='Opt', ribbon=ribbon))
+            session.flush()
+            yield session
+            session.rollback()
+
+    def matching_ribbons(self, session, *filters):
+        return sorted(a.ribbon for a in session.query(Attendee).filter(Attendee.last_name == 'Opt', *filters))
+
+    @pytest.mark.parametrize('opt,expected', [
+        (123, ['123', '123,456']),
+        (1234, ['1234']),
+        (456, ['123,456', '456']),
+        (12, []),
+        (23, []),
+    ])
+    def test_has_opt(self, session, opt, expected):
+        assert self.matching_ribbons(session, has_opt(Attendee.ribbon, opt)) == expected
+
+    @pytest.mark.parametrize('opt,expected', [
+        (123, ['', '1234', '456']),
+        (1234, ['', '123', '123,456', '456']),
+        (12, ['', '123', '123,456', '1234', '456']),
+    ])
+    def test_not_has_opt(self, session, opt, expected):
+        assert self.matching_ribbons(session, ~has_opt(Attendee.ribbon, opt)) == expected
+
+    def test_postgres_uses_array_containment(self):
+        sql = str(has_opt(Attendee.ribbon, 123).compile(dialect=postgresql.dialect()))
+        assert "string_to_array(attendee.ribbon, ',') @>" in sql
+
+    def test_sqlite_matches_delimited_value(self):
+        sql = str(has_opt(Attendee.ribbon, 123).compile(dialect=sqlite.dialect()))
+        assert "(',' || attendee.ribbon || ',' LIKE '%,' || ? || ',%')" == sql
+
+    def test_default_dialect_matches_delimited_value(self):
+        sql = str(select([Attendee.id]).where(has_opt(Attendee.ribbon, 123)))
+        assert "',' || attendee.ribbon || ',' LIKE '%,' ||" in sql
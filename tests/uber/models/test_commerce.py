@@ -0,0 +1,51 @@
+import cherrypy
+import pytest
+import stripe
+from mock import Mock
+
+from uber.config import c
+from uber.models import ModelReceipt, ReceiptTransaction
+
+
+@pytest.fixture(autouse=True)
+def stripe_retrieve(monkeypatch):
+    monkeypatch.setattr(c, 'AUTHORIZENET_LOGIN_ID', '')
+    retrieve = Mock(return_value=Mock(status='succeeded', latest_charge='ch_123'))
+    monkeypatch.setattr(stripe.PaymentIntent, 'retrieve', retrieve)
+    yield retrieve
+    if hasattr(cherrypy.request, 'succeeded_stripe_intents'):
+        del cherrypy.request.succeeded_stripe_intents
+
+
+@pytest.fixture
+def in_request(monkeypatch):
+    monkeypatch.setattr(cherrypy.request, 'app', Mock())
+
+
+def shared_intent_txns():
+    return [ReceiptTransaction(receipt=ModelReceipt(), intent_id='pi_123', method=c.STRIPE) for _ in range(2)]
+
+
+def test_succeeded_intent_retrieved_once_per_request(in_request, stripe_retrieve):
+    intents = [txn.get_stripe_intent() for txn in shared_intent_txns()]
+    assert stripe_retrieve.call_count == 1
+    assert intents[0] is intents[1]
+
+
+def test_pending_intent_not_cached(in_request, stripe_retrieve):
+    stripe_retrieve.return_value = Mock(status='requires_payment_method')
+    for txn in shared_intent_txns():
+        txn.get_stripe_intent()
+    assert stripe_retrieve.call_count == 2
+
+
+def test_expanded_intent_not_cached(in_request, stripe_retrieve):
+    for txn in shared_intent_txns():
+        txn.get_stripe_intent(expand=['latest_charge.balance_transaction'])
+    assert stripe_retrieve.call_count == 2
+
+
+def test_intent_not_cached_outside_request(stripe_retrieve):
+    for txn in shared_intent_txns():
+        txn.get_stripe_intent()
+    assert stripe_retrieve.call_count == 2
@@ -933,6 +933,7 @@ class Config(_Overridable):
 
     def get_shirt_count(self, shirt_enum_key):
         from uber.models import Session, Attendee
+        from uber.models.types import has_opt
         with Session() as session:
             shirt_count = 0
 
@@ -950,7 +951,7 @@ class Config(_Overridable):
                 shirt_count += staff_event_shirts or 0
 
             if c.HOURS_FOR_SHIRT:
-                shirt_count += base_query.filter(Attendee.ribbon.contains(c.VOLUNTEER_RIBBON)).count()
+                shirt_count += base_query.filter(has_opt(Attendee.ribbon, c.VOLUNTEER_RIBBON)).count()
 
         return shirt_count
 
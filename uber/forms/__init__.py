@@ -68,7 +68,7 @@ def load_forms(params, model, form_list, prefix_dict={}, get_optional=True,
                     alias_dict[aliased_field] = alias_val
 
         loaded_form = form_cls(params, model, prefix=prefix_dict.get(form_name, ''))
-        optional_fields = loaded_form.get_optional_fields(model) if get_optional else []
+        optional_fields = set(loaded_form.get_optional_fields(model)) if get_optional else set()
 
         for name, field in loaded_form._fields.items():
             if name in optional_fields:
@@ -442,6 +442,49 @@ class SelectAvailableField(SelectField):
             yield (value, label, coerced_val == self.data)
 
 
+class IntSelectMultipleField(SelectMultipleField):
+    """
+    A multi-select field whose choice values are all integers, e.g., our config-defined _OPTS lists.
+    Submitted values and choices are compared through sets, so rendering and validating a field with
+    dozens of options doesn't re-coerce every choice once per submitted value.
+    """
+
+    def __init__(self, label=None, validators=None, choices=None, validate_choice=True, **kwargs):
+        super().__init__(label, validators, int, choices, validate_choice, **kwargs)
+
+    def _choices_generator(self, choices):
+        if not choices:
+            _choices = []
+        elif isinstance(choices[0], (list, tuple)):
+            _choices = choices
+        else:
+            _choices = zip(choices, choices)
+
+        selected_values = set(self.data) if self.data is not None else ()
+        for value, label, *other_args in _choices:
+            render_kw = other_args[0] if len(other_args) else {}
+            yield (value, label, int(value) in selected_values, render_kw)
+
+    def pre_validate(self, form):
+        if not self.validate_choice or not self.data:
+            return
+
+        if self.choices is None:
+            raise TypeError(self.gettext("Choices cannot be None."))
+
+        acceptable = {int(choice[0]) for choice in self.iter_choices()}
+        unacceptable = set(self.data) - acceptable
+        if unacceptable:
+            raise ValidationError(
+                self.ngettext(
+                    "'%(value)s' is not a valid choice for this field.",
+                    "'%(value)s' are not valid choices for this field.",
+                    len(unacceptable),
+                )
+                % dict(value="', '".join(str(value) for value in unacceptable))
+            )
+
+
 class DictWrapper(dict):
     def getlist(self, arg):
         if arg in self:
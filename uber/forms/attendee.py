@@ -1,4 +1,5 @@
 import cherrypy
+import re
 from datetime import date
 
 from markupsafe import Markup
@@ -9,7 +10,7 @@ from wtforms.validators import ValidationError, StopValidation
 
 from uber.config import c
 from uber.forms import (AddressForm, MultiCheckbox, MagForm, SelectAvailableField, SwitchInput, NumberInputGroup,
-                        HiddenBoolField, HiddenIntField, CustomValidation)
+                        HiddenBoolField, HiddenIntField, CustomValidation, IntSelectMultipleField)
 from uber.custom_tags import popup_link
 from uber.badge_funcs import get_real_badge_type
 from uber.models import Attendee, Session, PromoCodeGroup
@@ -21,6 +22,29 @@ __all__ = ['AdminBadgeExtras', 'AdminBadgeFlags', 'AdminConsents', 'AdminStaffin
            'BadgeFlags', 'BadgeAdminNotes', 'PersonalInfo', 'PreregOtherInfo', 'OtherInfo', 'StaffingInfo', 'Consents']
 
 
+RE_BADGE_PRINTED_CHARS = re.compile(c.VALID_BADGE_PRINTED_CHARS)
+
+
+def _build_pii_consent_label():
+    base_label = f"<strong>Yes</strong>, I understand and agree that {c.ORGANIZATION_NAME} will store "\
+        "the personal information I provided above for the limited purposes of contacting me about my registration"
+    label = base_label
+    if c.HOTELS_ENABLED:
+        label += ', hotel accommodations'
+    if c.DONATIONS_ENABLED:
+        label += ', donations'
+    if c.ACCESSIBILITY_SERVICES_ENABLED:
+        label += ', accessibility needs'
+    if label != base_label:
+        label += ','
+    label += ' or volunteer opportunities selected at sign-up.'
+    return Markup(label)
+
+
+# Built from config values that can't change at runtime, so there's no need to rebuild it for every form
+PII_CONSENT_LABEL = _build_pii_consent_label()
+
+
 # TODO: turn this into a proper validation class
 def valid_cellphone(form, field):
     if field.data and invalid_phone_number(field.data):
@@ -46,7 +70,7 @@ class PersonalInfo(AddressForm, MagForm):
         validators.DataRequired("Please enter a name to be printed on your badge."),
         validators.Length(max=20, message="Your printed badge name is too long. \
                           Please use less than 20 characters."),
-        validators.Regexp(c.VALID_BADGE_PRINTED_CHARS, message="Your printed badge name has invalid characters. \
+        validators.Regexp(RE_BADGE_PRINTED_CHARS, message="Your printed badge name has invalid characters. \
                           Please use only alphanumeric characters and symbols.")
         ], description="Badge names have a maximum of 20 characters.")
     email = EmailField('Email Address', validators=[
@@ -132,15 +156,16 @@ class PersonalInfo(AddressForm, MagForm):
     def get_non_admin_locked_fields(self, attendee):
         locked_fields = []
 
-        if attendee.is_new or attendee.badge_status in [c.PENDING_STATUS, c.AT_DOOR_PENDING_STATUS]:
+        badge_status = attendee.badge_status
+        if attendee.is_new or badge_status in [c.PENDING_STATUS, c.AT_DOOR_PENDING_STATUS]:
             return locked_fields
-        elif not attendee.is_valid or attendee.badge_status == c.REFUNDED_STATUS:
-            return list(self._fields.keys())
+        elif badge_status == c.REFUNDED_STATUS or not attendee.is_valid:
+            return list(self._fields)
 
         if attendee.valid_placeholder or attendee.unassigned_group_reg:
             return locked_fields
 
-        return locked_fields + ['first_name', 'last_name', 'legal_name', 'same_legal_name']
+        return ['first_name', 'last_name', 'legal_name', 'same_legal_name']
 
     @new_or_changed_validation.badge_type
     def past_printed_deadline(form, field):
@@ -207,10 +232,11 @@ class BadgeExtras(MagForm):
         if attendee.is_new:
             return locked_fields
 
-        if not attendee.is_valid or attendee.badge_status == c.REFUNDED_STATUS:
-            return list(self._fields.keys())
+        badge_status = attendee.badge_status
+        if badge_status == c.REFUNDED_STATUS or not attendee.is_valid:
+            return list(self._fields)
 
-        if attendee.active_receipt or attendee.badge_status == c.DEFERRED_STATUS:
+        if badge_status == c.DEFERRED_STATUS or attendee.active_receipt:
             locked_fields.extend(['badge_type', 'amount_extra', 'extra_donation'])
         elif not c.BADGE_TYPE_PRICES:
             locked_fields.append('badge_type')
@@ -271,8 +297,8 @@ class OtherInfo(MagForm):
     field_validation, new_or_changed_validation = CustomValidation(), CustomValidation()
 
     promo_code_code = StringField('Promo Code')
-    interests = SelectMultipleField('What interests you?', choices=c.INTEREST_OPTS, coerce=int,
-                                    validators=[validators.Optional()], widget=MultiCheckbox())
+    interests = IntSelectMultipleField('What interests you?', choices=c.INTEREST_OPTS,
+                                       validators=[validators.Optional()], widget=MultiCheckbox())
     requested_accessibility_services = BooleanField(
         f'I would like to be contacted by the {c.EVENT_NAME} Accessibility Services department prior to the event '
         'and I understand my contact information will be shared with Accessibility Services for this purpose.',
@@ -284,8 +310,8 @@ class OtherInfo(MagForm):
         if attendee.is_new:
             return locked_fields
 
-        if not attendee.is_valid or attendee.badge_status == c.REFUNDED_STATUS:
-            return list(self._fields.keys())
+        if attendee.badge_status == c.REFUNDED_STATUS or not attendee.is_valid:
+            return list(self._fields)
 
         return locked_fields
     
@@ -327,8 +353,8 @@ class StaffingInfo(MagForm):
         if attendee.is_new:
             return locked_fields
 
-        if not attendee.is_valid or attendee.badge_status == c.REFUNDED_STATUS:
-            return list(self._fields.keys())
+        if attendee.badge_status == c.REFUNDED_STATUS or not attendee.is_valid:
+            return list(self._fields)
 
         if attendee.badge_type in [c.STAFF_BADGE, c.CONTRACTOR_BADGE] or attendee.shifts:
             locked_fields.append('staffing')
@@ -376,9 +402,7 @@ class Consents(MagForm):
         f'Please send me emails relating to {c.EVENT_NAME} and {c.ORGANIZATION_NAME} in future years.',
         description=popup_link("../static_views/privacy.html", "View Our Spam Policy"))
     pii_consent = BooleanField(
-        Markup(f'<strong>Yes</strong>, I understand and agree that {c.ORGANIZATION_NAME} will store '
-               'the personal information I provided above for the limited purposes '
-               'of contacting me about my registration'),
+        PII_CONSENT_LABEL,
         validators=[validators.InputRequired("You must agree to allow us to store your personal "
                                              "information in order to register.")],
         description=Markup(f'For more information please check out our <a href="{c.PRIVACY_POLICY_URL}" '
@@ -400,19 +424,7 @@ class Consents(MagForm):
         return optional_fields
 
     def pii_consent_label(self):
-        base_label = f"<strong>Yes</strong>, I understand and agree that {c.ORGANIZATION_NAME} will store "\
-            "the personal information I provided above for the limited purposes of contacting me about my registration"
-        label = base_label
-        if c.HOTELS_ENABLED:
-            label += ', hotel accommodations'
-        if c.DONATIONS_ENABLED:
-            label += ', donations'
-        if c.ACCESSIBILITY_SERVICES_ENABLED:
-            label += ', accessibility needs'
-        if label != base_label:
-            label += ','
-        label += ' or volunteer opportunities selected at sign-up.'
-        return Markup(label)
+        return PII_CONSENT_LABEL
 
 
 class AdminConsents(Consents):
@@ -446,8 +458,8 @@ class AdminBadgeFlags(BadgeFlags):
     badge_type = SelectField('Badge Type', coerce=int, choices=c.BADGE_OPTS)
     badge_num = StringField('Badge #', validators=[validators.Optional()], default='')
     no_badge_num = BooleanField('Omit badge #')
-    ribbon = SelectMultipleField('Ribbons', coerce=int, validators=[validators.Optional()],
-                                 choices=c.RIBBON_OPTS, widget=MultiCheckbox())
+    ribbon = IntSelectMultipleField('Ribbons', validators=[validators.Optional()],
+                                    choices=c.RIBBON_OPTS, widget=MultiCheckbox())
     group_id = SelectField('Group')
     paid = SelectField('Paid Status', coerce=int, choices=c.PAYMENT_OPTS)
     overridden_price = IntegerField('Base Badge Price', validators=[
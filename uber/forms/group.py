@@ -1,11 +1,12 @@
 from markupsafe import Markup
 from wtforms import (BooleanField, DecimalField, EmailField,
-                     SelectField, SelectMultipleField, IntegerField,
+                     SelectField, IntegerField,
                      StringField, TelField, validators, TextAreaField)
 from wtforms.validators import ValidationError
 
 from uber.config import c
-from uber.forms import AddressForm, CustomValidation, MultiCheckbox, MagForm, IntSelect, NumberInputGroup
+from uber.forms import (AddressForm, CustomValidation, MultiCheckbox, MagForm, IntSelect, IntSelectMultipleField,
+                        NumberInputGroup)
 from uber.forms.attendee import valid_cellphone
 from uber.custom_tags import format_currency, pluralize
 from uber.model_checks import invalid_phone_number
@@ -42,7 +43,7 @@ class AdminGroupInfo(GroupInfo):
                              description=f"{c.DEALER_TERM.title()}s are prevented from paying until they are approved,"
                              "but may assign and purchase add-ons for badges.")
     new_badge_type = SelectField('Badge Type', choices=c.BADGE_OPTS, coerce=int)
-    new_ribbons = SelectMultipleField('Badge Ribbons', choices=c.RIBBON_OPTS, coerce=int, widget=MultiCheckbox())
+    new_ribbons = IntSelectMultipleField('Badge Ribbons', choices=c.RIBBON_OPTS, widget=MultiCheckbox())
     cost = IntegerField('Total Group Price', validators=[
         validators.NumberRange(min=0, message="Total Group Price must be a number that is 0 or higher.")
     ], widget=NumberInputGroup())
@@ -95,9 +96,9 @@ class TableInfo(GroupInfo):
                                 "for us to evaluate your submission.")
         ], description="Please be detailed; include a link to view your wares. "
         "You must include links to what you sell or a portfolio otherwise you will be automatically waitlisted.")
-    categories = SelectMultipleField('Categories', validators=[
+    categories = IntSelectMultipleField('Categories', validators=[
         validators.DataRequired("Please select at least one category your wares fall under.")
-        ], choices=c.DEALER_WARES_OPTS, coerce=int, widget=MultiCheckbox())
+        ], choices=c.DEALER_WARES_OPTS, widget=MultiCheckbox())
     categories_text = StringField('Other')
     special_needs = TextAreaField('Special Requests', description="No guarantees that we can accommodate any requests.")
 
@@ -113,7 +114,7 @@ class TableInfo(GroupInfo):
         elif group.status in c.DEALER_EDITABLE_STATUSES:
             return ['tables']
 
-        return list(self._fields.keys())
+        return list(self._fields)
 
     def badges_label(self):
         return "Badges (" + format_currency(c.DEALER_BADGE_PRICE) + " each)"
@@ -1,3 +1,5 @@
+import functools
+
 from markupsafe import escape, Markup
 from wtforms.widgets import NumberInput, html_params, CheckboxInput, Select
 from uber.config import c
@@ -15,16 +17,15 @@ class MultiCheckbox():
         html.append(f'<legend class="form-text mt-0"><span class="form-label">{field.label.text}</span>'
                     '{}</legend>'.format(Markup(' <span class="required-indicator text-danger">*</span>')
                                          if field.flags.required else ''))
+        # Attributes shared by every checkbox are rendered once, rather than once per choice
+        shared_params = html_params(**dict(kwargs, name=field.name))
         for value, label, checked, _html_attribs in field.iter_choices():
-            choice_id = '{}-{}'.format(field_id, value)
-            options = dict(kwargs, name=field.name, value=value, id=choice_id)
+            choice_id = escape(f'{field_id}-{value}')
             if value == c.OTHER:
                 html.append('<br/>')
-            if checked:
-                options['checked'] = 'checked'
-            html.append('<label for="{}" class="checkbox-label">'.format(choice_id))
-            html.append('<input {} /> '.format(html_params(**options)))
-            html.append('{}</label>'.format(label))
+            html.append(f'<label for="{choice_id}" class="checkbox-label">'
+                        f'<input {shared_params} value="{escape(value)}" id="{choice_id}"'
+                        f'{" checked" if checked else ""} /> {label}</label>')
         html.append('</fieldset>')
         html.append('</div>')
         return Markup(''.join(html))
@@ -68,20 +69,33 @@ class NumberInputGroup(NumberInput):
         super().__init__(**kwargs)
 
     def __call__(self, field, **kwargs):
-        html = []
-        if self.prefix:
-            html.append('<span class="input-group-text">{}</span>'.format(self.prefix))
-        html.append(super().__call__(field, **kwargs))
-        if self.suffix:
-            html.append('<span class="input-group-text rounded-end">{}</span>'.format(self.suffix))
+        prefix = f'<span class="input-group-text">{self.prefix}</span>' if self.prefix else ''
+        suffix = f'<span class="input-group-text rounded-end">{self.suffix}</span>' if self.suffix else ''
 
-        return Markup(''.join(html))
+        return Markup(f'{prefix}{super().__call__(field, **kwargs)}{suffix}')
+
+
+@functools.lru_cache(maxsize=1024)
+def _render_country_option(value, label, selected, **kwargs):
+    options = dict(kwargs, value=value)
+    if c.COUNTRY_ALT_SPELLINGS.get(value):
+        options["data-alternative-spellings"] = c.COUNTRY_ALT_SPELLINGS[value]
+        if value == 'United States':
+            options["data-relevancy-booster"] = 3
+        elif value in ['Australia', 'Canada', 'United Kingdom']:
+            options["data-relevancy-booster"] = 2
+    if selected:
+        options["selected"] = True
+    return Markup(
+        "<option {}>{}</option>".format(html_params(**options), escape(label))
+    )
 
 
 class CountrySelect(Select):
     """
     Renders a custom select field for countries.
     This is the same as Select but it adds data-alternative-spellings and data-relevancy-booster flags.
+    The country list never changes while the server is running, so rendered options are cached.
     """
 
     @classmethod
@@ -90,15 +104,7 @@ class CountrySelect(Select):
             # Handle the special case of a 'True' value.
             value = str(value)
 
-        options = dict(kwargs, value=value)
-        if c.COUNTRY_ALT_SPELLINGS.get(value):
-            options["data-alternative-spellings"] = c.COUNTRY_ALT_SPELLINGS[value]
-            if value == 'United States':
-                options["data-relevancy-booster"] = 3
-            elif value in ['Australia', 'Canada', 'United Kingdom']:
-                options["data-relevancy-booster"] = 2
-        if selected:
-            options["selected"] = True
-        return Markup(
-            "<option {}>{}</option>".format(html_params(**options), escape(label))
-        )
+        if kwargs:
+            # Per-choice render_kw dicts may not be hashable, so skip the cache for them
+            return _render_country_option.__wrapped__(value, label, selected, **kwargs)
+        return _render_country_option(value, label, bool(selected))
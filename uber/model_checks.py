@@ -105,7 +105,15 @@ def admin_has_required_api_access(api_token):
                 return 'You do not have permission to create a token with {} access'.format(c.API_ACCESS[access_level])
 
 
+# Matches the common case of a 10-digit US number with an optional leading 1 or +1. US area codes never start with
+# 0 or 1, so anything this matches is a number that phonenumbers would also accept and we can skip parsing it.
+RE_US_PHONE_NUMBER = re.compile(r'(?:\+?1[ .-]?)?(?:\([2-9][0-9]{2}\)|[2-9][0-9]{2})[ .-]?[0-9]{3}[ .-]?[0-9]{4}')
+
+
 def invalid_phone_number(s):
+    if s and RE_US_PHONE_NUMBER.fullmatch(s):
+        return False
+
     try:
         # parse input as a US number, unless a leading + is provided,
         # in which case the input will be validated according to the country code
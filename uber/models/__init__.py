@@ -33,7 +33,7 @@ import uber
 from uber.config import c, create_namespace_uuid
 from uber.errors import HTTPRedirect
 from uber.decorators import cost_property, department_id_adapter, presave_adjustment, suffix_property
-from uber.models.types import Choice, DefaultColumn as Column, MultiChoice
+from uber.models.types import has_opt, Choice, DefaultColumn as Column, MultiChoice
 from uber.utils import check_csrf, normalize_email_legacy, create_new_hash, DeptChecklistConf, \
     valid_email, valid_password
 from uber.payments import ReceiptManager
@@ -98,21 +98,35 @@ class MagModel:
     def _class_attr_names(cls):
         return [
             s for s in dir(cls)
-            if s not in ('_class_attrs', '_class_attr_names') and
+            if s not in ('_class_attrs', '_class_attr_names', '_presave_adjustment_names',
+                         '_predelete_adjustment_names') and
             not s.startswith('_cached_')]
 
     @cached_classproperty
     def _class_attrs(cls):
         return {s: getattr(cls, s) for s in cls._class_attr_names}
 
+    @classmethod
+    def _adjustment_callback_names(cls, label):
+        callbacks = [(getattr(attr, label), name) for name, attr in cls._class_attrs.items()
+                     if hasattr(attr, '__call__') and hasattr(attr, label)]
+        return [name for order, name in sorted(callbacks)]
+
+    @cached_classproperty
+    def _presave_adjustment_names(cls):
+        return cls._adjustment_callback_names('presave_adjustment')
+
+    @cached_classproperty
+    def _predelete_adjustment_names(cls):
+        return cls._adjustment_callback_names('predelete_adjustment')
+
     def _invoke_adjustment_callbacks(self, label):
-        callbacks = []
-        for name, attr in self._class_attrs.items():
-            if hasattr(attr, '__call__') and hasattr(attr, label):
-                callbacks.append(getattr(self, name))
-        callbacks.sort(key=lambda f: getattr(f, label))
-        for function in callbacks:
-            function()
+        """
+        Calls every method decorated with the given adjustment label, in the order they were declared. Finding
+        those methods means checking every attribute on the class, so we only do that once per class.
+        """
+        for name in getattr(self, '_{}_names'.format(label)):
+            getattr(self, name)()
 
     def presave_adjustments(self):
         self._invoke_adjustment_callbacks('presave_adjustment')
@@ -819,10 +833,10 @@ class Session(SessionManager):
             # Guest groups
             for group_type, badge_and_ribbon_filter in [(c.BAND,
                                                          and_(Attendee.badge_type == c.GUEST_BADGE,
-                                                              Attendee.ribbon.contains(c.BAND))),
+                                                              has_opt(Attendee.ribbon, c.BAND))),
                                                         (c.GUEST,
                                                          and_(Attendee.badge_type == c.GUEST_BADGE,
-                                                              ~Attendee.ribbon.contains(c.BAND)))]:
+                                                              ~has_opt(Attendee.ribbon, c.BAND)))]:
                 return_dict[c.GROUP_TYPES[group_type].lower() + '_admin'] = (
                     self.query(Attendee).join(Group, Attendee.group_id == Group.id)
                         .join(GuestGroup, Group.id == GuestGroup.group_id).filter(
@@ -840,7 +854,7 @@ class Session(SessionManager):
                 )
 
             return_dict['panels_admin'] = self.query(Attendee).outerjoin(PanelApplicant).filter(
-                                                 or_(Attendee.ribbon.contains(c.PANELIST_RIBBON),
+                                                 or_(has_opt(Attendee.ribbon, c.PANELIST_RIBBON),
                                                      Attendee.panel_applications != None,  # noqa: E711
                                                      Attendee.assigned_panelists != None,  # noqa: E711
                                                      Attendee.panel_applicants != None,  # noqa: E711
@@ -1651,7 +1665,7 @@ class Session(SessionManager):
 
         def all_panelists(self):
             return self.query(Attendee).filter(or_(
-                Attendee.ribbon.contains(c.PANELIST_RIBBON),
+                has_opt(Attendee.ribbon, c.PANELIST_RIBBON),
                 Attendee.badge_type == c.GUEST_BADGE)).order_by(Attendee.full_name).all()
 
         @department_id_adapter
@@ -1855,8 +1869,8 @@ class Session(SessionManager):
                         elif target == 'group':
                             attr_search_filter = Group.normalized_name.contains(search_term.strip().lower())
                         elif target == 'has_ribbon':
-                            attr_search_filter = Attendee.ribbon.contains(
-                                Attendee.ribbon.type.convert_if_labels(search_term.title()))
+                            attr_search_filter = has_opt(
+                                Attendee.ribbon, Attendee.ribbon.type.convert_if_labels(search_term.title()))
                         elif target in Attendee.searchable_bools:
                             t_or_f = search_term.strip().lower() not in ('f', 'false', 'n', 'no', '0', 'none')
                             attr_search_filter = getattr(Attendee, target) == t_or_f
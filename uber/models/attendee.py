@@ -24,7 +24,7 @@ from uber.decorators import department_id_adapter, predelete_adjustment, presave
 from uber.models import MagModel
 from uber.models.group import Group
 from uber.models.types import default_relationship as relationship, utcnow, Choice, DefaultColumn as Column, \
-    MultiChoice, TakesPaymentMixin
+    MultiChoice, TakesPaymentMixin, has_opt
 from uber.utils import add_opt, get_age_from_birthday, get_age_conf_from_birthday, hour_day_format, \
     localized_now, mask_string, normalize_email, normalize_email_legacy, remove_opt
 
@@ -446,6 +446,8 @@ class Attendee(MagModel, TakesPaymentMixin):
     ]
     if not c.SQLALCHEMY_URL.startswith('sqlite'):
         _attendee_table_args.append(UniqueConstraint('badge_num', deferrable=True, initially='DEFERRED'))
+        _attendee_table_args.append(Index('ix_attendee_ribbon_opts', func.string_to_array(ribbon, ','),
+                                          postgresql_using='gin'))
 
     __table_args__ = tuple(_attendee_table_args)
     _repr_attr_names = ['full_name']
@@ -560,17 +562,17 @@ class Attendee(MagModel, TakesPaymentMixin):
 
     @presave_adjustment
     def staffing_badge_and_ribbon_adjustments(self):
-        if self.badge_type in [c.STAFF_BADGE, c.CONTRACTOR_BADGE]:
-            self.ribbon = remove_opt(self.ribbon_ints, c.VOLUNTEER_RIBBON)
-
-        elif self.staffing and not self.volunteering_badge_or_ribbon:
-            self.ribbon = add_opt(self.ribbon_ints, c.VOLUNTEER_RIBBON)
+        ribbon_ints = self.ribbon_ints
 
         if self.badge_type in [c.STAFF_BADGE, c.CONTRACTOR_BADGE]:
+            self.ribbon = remove_opt(ribbon_ints, c.VOLUNTEER_RIBBON)
             self.staffing = True
             if not self.overridden_price and self.paid in [c.NOT_PAID, c.PAID_BY_GROUP]:
                 self.paid = c.NEED_NOT_PAY
 
+        elif self.staffing and not self.volunteering_badge_or_ribbon:
+            self.ribbon = add_opt(ribbon_ints, c.VOLUNTEER_RIBBON)
+
     @presave_adjustment
     def _badge_adjustments(self):
         from uber.badge_funcs import needs_badge_num
@@ -590,10 +592,11 @@ class Attendee(MagModel, TakesPaymentMixin):
     @presave_adjustment
     def _use_promo_code(self):
         if c.BADGE_PROMO_CODES_ENABLED and self.promo_code and not self.overridden_price and self.is_unpaid:
-            log.debug(self.badge_cost_with_promo_code)
+            badge_cost_with_promo_code = self.badge_cost_with_promo_code
+            log.debug(badge_cost_with_promo_code)
             log.debug(self.promo_code)
-            if self.badge_cost_with_promo_code > 0:
-                self.overridden_price = self.badge_cost_with_promo_code
+            if badge_cost_with_promo_code > 0:
+                self.overridden_price = badge_cost_with_promo_code
             else:
                 self.paid = c.NEED_NOT_PAY
 
@@ -823,15 +826,19 @@ class Attendee(MagModel, TakesPaymentMixin):
         # All other badge type changes (i.e. those not to/from a badge type in BADGE_TYPE_PRICES)
         # use the attendee's actual current badge cost
 
+        badge_type_prices = c.BADGE_TYPE_PRICES
+        badge_type = self.badge_type
+
+        if badge_type in badge_type_prices and current_badge_type in badge_type_prices:
+            return badge_type_prices[badge_type] - badge_type_prices[current_badge_type]
+
         base_badge_cost = self.new_badge_cost if self.paid == c.NEED_NOT_PAY \
             else self.calculate_badge_cost() + self.age_discount
 
-        if self.badge_type in c.BADGE_TYPE_PRICES and current_badge_type in c.BADGE_TYPE_PRICES:
-            return c.BADGE_TYPE_PRICES[self.badge_type] - c.BADGE_TYPE_PRICES[current_badge_type]
-        elif current_badge_type in c.BADGE_TYPE_PRICES:
-            return base_badge_cost - c.BADGE_TYPE_PRICES[current_badge_type]
-        elif self.badge_type in c.BADGE_TYPE_PRICES:
-            return c.BADGE_TYPE_PRICES[self.badge_type] - base_badge_cost
+        if current_badge_type in badge_type_prices:
+            return base_badge_cost - badge_type_prices[current_badge_type]
+        elif badge_type in badge_type_prices:
+            return badge_type_prices[badge_type] - base_badge_cost
         else:
             return 0
 
@@ -884,11 +891,13 @@ class Attendee(MagModel, TakesPaymentMixin):
         # We dynamically calculate the age discount to be half the
         # current badge price. If for some reason the default discount
         # (if it exists) is greater than half off, we use that instead.
-        if self.age_now_or_at_con and self.age_now_or_at_con < 13:
+        age = self.age_now_or_at_con
+        discount = self.age_group_conf['discount']
+        if age and age < 13:
             half_off = math.ceil(self.new_badge_cost / 2)
-            if not self.age_group_conf['discount'] or self.age_group_conf['discount'] < half_off:
+            if not discount or discount < half_off:
                 return -half_off
-        return -self.age_group_conf['discount']
+        return -discount
 
     @property
     def age_group_conf(self):
@@ -1060,10 +1069,11 @@ class Attendee(MagModel, TakesPaymentMixin):
     def calc_promo_discount_change(self, promo_code_code):
         badge_cost = self.calculate_badge_cost() * 100
         if self.promo_code:
-            if badge_cost == (self.badge_cost_with_promo_code * 100):
+            badge_cost_with_promo_code = self.badge_cost_with_promo_code * 100
+            if badge_cost == badge_cost_with_promo_code:
                 current_discount = badge_cost * -1
             else:
-                current_discount = (badge_cost - (self.badge_cost_with_promo_code * 100)) * -1
+                current_discount = (badge_cost - badge_cost_with_promo_code) * -1
         else:
             current_discount = 0
         if promo_code_code:
@@ -1160,7 +1170,7 @@ class Attendee(MagModel, TakesPaymentMixin):
     @is_dealer.expression
     def is_dealer(cls):
         return or_(
-            cls.ribbon.like('%{}%'.format(c.DEALER_RIBBON)),
+            has_opt(cls.ribbon, c.DEALER_RIBBON),
             and_(
                 cls.paid == c.PAID_BY_GROUP,
                 exists().select_from(Group).where(
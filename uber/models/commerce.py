@@ -1,4 +1,6 @@
 from datetime import datetime
+from operator import attrgetter
+import cherrypy
 import stripe
 
 from pytz import UTC
@@ -7,7 +9,7 @@ from residue import JSON, CoerceUTF8 as UnicodeText, UTCDateTime, UUID
 from sqlalchemy import and_, case, func, or_, select
 
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.schema import ForeignKey
+from sqlalchemy.schema import ForeignKey, Index
 from sqlalchemy.types import Boolean, Integer
 from sqlalchemy.dialects.postgresql.json import JSONB
 from sqlalchemy.ext.mutable import MutableDict
@@ -17,7 +19,7 @@ from uber.config import c
 from uber.custom_tags import format_currency
 from uber.models import MagModel
 from uber.models.attendee import Attendee
-from uber.models.types import default_relationship as relationship, Choice, DefaultColumn as Column
+from uber.models.types import default_relationship as relationship, utcnow, Choice, DefaultColumn as Column
 from uber.payments import ReceiptManager
 
 
@@ -29,7 +31,7 @@ __all__ = [
 class ArbitraryCharge(MagModel):
     amount = Column(Integer)
     what = Column(UnicodeText)
-    when = Column(UTCDateTime, default=lambda: datetime.now(UTC))
+    when = Column(UTCDateTime, server_default=utcnow())
     reg_station = Column(Integer, nullable=True)
 
     _repr_attr_names = ['what']
@@ -57,7 +59,7 @@ class MerchPickup(MagModel):
 class MPointsForCash(MagModel):
     attendee_id = Column(UUID, ForeignKey('attendee.id'))
     amount = Column(Integer)
-    when = Column(UTCDateTime, default=lambda: datetime.now(UTC))
+    when = Column(UTCDateTime, server_default=utcnow())
 
 
 class NoShirt(MagModel):
@@ -71,7 +73,7 @@ class NoShirt(MagModel):
 class OldMPointExchange(MagModel):
     attendee_id = Column(UUID, ForeignKey('attendee.id'))
     amount = Column(Integer)
-    when = Column(UTCDateTime, default=lambda: datetime.now(UTC))
+    when = Column(UTCDateTime, server_default=utcnow())
 
 
 class Sale(MagModel):
@@ -79,7 +81,7 @@ class Sale(MagModel):
     what = Column(UnicodeText)
     cash = Column(Integer, default=0)
     mpoints = Column(Integer, default=0)
-    when = Column(UTCDateTime, default=lambda: datetime.now(UTC))
+    when = Column(UTCDateTime, server_default=utcnow())
     reg_station = Column(Integer, nullable=True)
     payment_method = Column(Choice(c.SALE_OPTS), default=c.MERCH)
 
@@ -102,15 +104,16 @@ class ModelReceipt(MagModel):
 
     @property
     def all_sorted_items_and_txns(self):
-        return sorted(self.receipt_items + self.receipt_txns, key=lambda x: x.added)
+        # Both collections are loaded in order, so this is a single merge of two sorted runs
+        return sorted(self.receipt_items + self.receipt_txns, key=attrgetter('added'))
 
     @property
     def total_processing_fees(self):
-        return sum([txn.calc_processing_fee(txn.amount) for txn in self.refundable_txns])
+        return sum(txn.calc_processing_fee(txn.amount) for txn in self.refundable_txns)
 
     @property
     def remaining_processing_fees(self):
-        return sum([txn.calc_processing_fee(txn.amount_left) for txn in self.refundable_txns])
+        return sum(txn.calc_processing_fee(txn.amount_left) for txn in self.refundable_txns)
 
     @property
     def open_receipt_items(self):
@@ -122,7 +125,8 @@ class ModelReceipt(MagModel):
 
     @property
     def charge_description_list(self):
-        return ", ".join([item.desc + " x" + str(item.count) for item in self.open_receipt_items if item.amount > 0])
+        return ", ".join(f"{item.desc} x{item.count}" for item in self.receipt_items
+                         if not item.closed and item.amount > 0)
 
     @property
     def cancelled_txns(self):
@@ -138,16 +142,16 @@ class ModelReceipt(MagModel):
 
     @property
     def pending_total(self):
-        return sum([txn.amount for txn in self.receipt_txns if txn.is_pending_charge])
+        return sum(txn.amount for txn in self.receipt_txns if txn.is_pending_charge)
 
     @hybrid_property
     def payment_total(self):
-        return sum([txn.amount for txn in self.receipt_txns
-                    if not txn.cancelled and txn.amount > 0 and (txn.charge_id or txn.intent_id == '')])
+        return sum(txn.amount for txn in self.receipt_txns
+                   if not txn.cancelled and txn.amount > 0 and (txn.charge_id or txn.intent_id == ''))
 
     @payment_total.expression
     def payment_total(cls):
-        return select([func.sum(ReceiptTransaction.amount)]).where(
+        return select([func.coalesce(func.sum(ReceiptTransaction.amount), 0)]).where(
             and_(ReceiptTransaction.receipt_id == cls.id,
                  ReceiptTransaction.cancelled == None,  # noqa: E711
                  ReceiptTransaction.amount > 0)).where(
@@ -156,11 +160,11 @@ class ModelReceipt(MagModel):
 
     @hybrid_property
     def refund_total(self):
-        return sum([txn.amount for txn in self.receipt_txns if txn.amount < 0]) * -1
+        return sum(txn.amount for txn in self.receipt_txns if txn.amount < 0) * -1
 
     @refund_total.expression
     def refund_total(cls):
-        return select([func.sum(ReceiptTransaction.amount) * -1]
+        return select([func.coalesce(func.sum(ReceiptTransaction.amount), 0) * -1]
                       ).where(and_(ReceiptTransaction.amount < 0, ReceiptTransaction.receipt_id == cls.id)
                               ).label('refund_total')
 
@@ -179,45 +183,67 @@ class ModelReceipt(MagModel):
 
     @hybrid_property
     def item_total(self):
-        return sum([(item.amount * item.count) for item in self.receipt_items])
+        return sum(item.amount * item.count for item in self.receipt_items)
 
     @item_total.expression
     def item_total(cls):
-        return select([func.sum(ReceiptItem.amount * ReceiptItem.count)]
+        return select([func.coalesce(func.sum(ReceiptItem.total_amount), 0)]
                       ).where(ReceiptItem.receipt_id == cls.id).label('item_total')
 
     @hybrid_property
     def txn_total(self):
-        return self.payment_total - self.refund_total
+        # Equivalent to payment_total - refund_total, but in a single pass over receipt_txns
+        return sum(txn.amount for txn in self.receipt_txns
+                   if txn.amount < 0 or (not txn.cancelled and txn.amount > 0
+                                         and (txn.charge_id or txn.intent_id == '')))
+
+    @txn_total.expression
+    def txn_total(cls):
+        return select([func.coalesce(func.sum(ReceiptTransaction.amount), 0)]).where(
+            and_(ReceiptTransaction.receipt_id == cls.id,
+                 or_(ReceiptTransaction.amount < 0,
+                     and_(ReceiptTransaction.cancelled == None,  # noqa: E711
+                          ReceiptTransaction.amount > 0,
+                          or_(ReceiptTransaction.charge_id != None,  # noqa: E711
+                              ReceiptTransaction.intent_id == ''))))).label('txn_total')
 
     @property
     def total_str(self):
+        txn_total = self.txn_total
         if self.closed:
-            return "{} in {}".format(format_currency(abs(self.txn_total / 100)),
-                                     "Payments" if self.txn_total >= 0 else "Refunds")
-
-        return "{} in {} and {} in {} = {} owe {}".format(format_currency(abs(self.item_total / 100)),
-                                                          "Purchases" if self.item_total >= 0 else "Credit",
-                                                          format_currency(abs(self.txn_total / 100)),
-                                                          "Payments" if self.txn_total >= 0 else "Refunds",
-                                                          "They" if self.current_receipt_amount >= 0 else "We",
-                                                          format_currency(abs(self.current_receipt_amount / 100)))
+            return "{} in {}".format(format_currency(abs(txn_total / 100)),
+                                     "Payments" if txn_total >= 0 else "Refunds")
+
+        item_total = self.item_total
+        current_receipt_amount = item_total - txn_total
+        return "{} in {} and {} in {} = {} owe {}".format(format_currency(abs(item_total / 100)),
+                                                          "Purchases" if item_total >= 0 else "Credit",
+                                                          format_currency(abs(txn_total / 100)),
+                                                          "Payments" if txn_total >= 0 else "Refunds",
+                                                          "They" if current_receipt_amount >= 0 else "We",
+                                                          format_currency(abs(current_receipt_amount / 100)))
 
     def get_last_incomplete_txn(self):
         from uber.models import Session
 
-        for txn in sorted(self.pending_txns, key=lambda t: t.added, reverse=True):
+        pending_txns = self.pending_txns
+        if not pending_txns:
+            return
+
+        # Pending charges don't count towards the amount owed, so updating or cancelling them below doesn't change it
+        amount_owed = self.current_amount_owed
+        for txn in sorted(pending_txns, key=lambda t: t.added, reverse=True):
             if c.AUTHORIZENET_LOGIN_ID:
                 error = None
             else:
                 error = txn.check_stripe_id()
-            if error or txn.amount != self.current_amount_owed:
-                if error or self.current_amount_owed == 0:
+            if error or txn.amount != amount_owed:
+                if error or amount_owed == 0:
                     txn.cancelled = datetime.now()  # TODO: Add logs to txns/items and log the cancellation reason?
 
-                if txn.amount != self.current_amount_owed and self.current_amount_owed:
+                if txn.amount != amount_owed and amount_owed:
                     if not c.AUTHORIZENET_LOGIN_ID:
-                        txn.amount = self.current_amount_owed
+                        txn.amount = amount_owed
                         stripe.PaymentIntent.modify(txn.intent_id, amount=txn.amount)
                     else:
                         txn.cancelled = datetime.now()
@@ -255,7 +281,8 @@ class ReceiptTransaction(MagModel):
     receipt_id = Column(UUID, ForeignKey('model_receipt.id', ondelete='SET NULL'), nullable=True)
     receipt = relationship('ModelReceipt', foreign_keys=receipt_id,
                            cascade='save-update, merge',
-                           backref=backref('receipt_txns', cascade='save-update, merge'))
+                           backref=backref('receipt_txns', cascade='save-update, merge',
+                                           order_by='ReceiptTransaction.added'))
     receipt_info_id = Column(UUID, ForeignKey('receipt_info.id', ondelete='SET NULL'), nullable=True)
     receipt_info = relationship('ReceiptInfo', foreign_keys=receipt_info_id,
                                 cascade='save-update, merge',
@@ -273,6 +300,10 @@ class ReceiptTransaction(MagModel):
     who = Column(UnicodeText)
     desc = Column(UnicodeText)
 
+    __table_args__ = (
+        Index('ix_receipt_transaction_receipt_id_added', receipt_id, added),
+    )
+
     @property
     def available_actions(self):
         # A list of actions that admins can do to this item.
@@ -409,13 +440,32 @@ class ReceiptTransaction(MagModel):
 
         intent_id = self.intent_id or self.get_intent_id_from_refund()
 
+        # During prereg, transactions on several receipts can share one intent. A succeeded intent never
+        # changes again, so we keep it on the current request instead of retrieving it once per receipt.
+        # Outside of a request (e.g., in background tasks) there's nothing to scope the cache to, so we skip it
+        if cherrypy.request.app and not expand:
+            succeeded_intents = getattr(cherrypy.request, 'succeeded_stripe_intents', None)
+            if succeeded_intents is None:
+                succeeded_intents = cherrypy.request.succeeded_stripe_intents = {}
+        else:
+            succeeded_intents = {}
+
+        if intent_id in succeeded_intents:
+            return succeeded_intents[intent_id]
+
         try:
-            return stripe.PaymentIntent.retrieve(intent_id, expand=expand)
+            intent = stripe.PaymentIntent.retrieve(intent_id, expand=expand)
         except Exception as e:
             log.error(e)
+        else:
+            if intent.status == "succeeded":
+                succeeded_intents[intent_id] = intent
+            return intent
 
     def check_paid_from_stripe(self, intent=None):
-        if self.charge_id or c.AUTHORIZENET_LOGIN_ID or self.method not in [c.STRIPE, c.MANUAL]:
+        # Only payments start with an intent; refunds would otherwise cost two Stripe lookups to find nothing to mark
+        if self.charge_id or (not self.intent_id and not intent) or c.AUTHORIZENET_LOGIN_ID \
+                or self.method not in [c.STRIPE, c.MANUAL]:
             return
 
         intent = intent or self.get_stripe_intent()
@@ -432,14 +482,15 @@ class ReceiptTransaction(MagModel):
         last_refund_id = None
         refunded_total = 0
         # TODO: Ideally would like this to work with SPIn terminals too
-        for refund in stripe.Refund.list(payment_intent=self.intent_id):
+        # Stripe's maximum page size means one request covers almost every intent;
+        # auto_paging_iter only fetches further pages if there actually are more refunds
+        for refund in stripe.Refund.list(payment_intent=self.intent_id, limit=100).auto_paging_iter():
             refunded_total += refund.amount
             last_refund_id = refund.id
             self.refund_id = self.refund_id or last_refund_id
         with Session() as session:
-            other_txns = session.query(ReceiptTransaction).filter_by(intent_id=self.intent_id
-                                                                     ).filter(ReceiptTransaction.id != self.id)
-            other_refunds = sum([txn.refunded for txn in other_txns])
+            other_refunds = session.query(func.coalesce(func.sum(ReceiptTransaction.refunded), 0)).filter(
+                ReceiptTransaction.intent_id == self.intent_id, ReceiptTransaction.id != self.id).scalar()
 
         self.refunded = min(self.amount, refunded_total - other_refunds)
         return self.refunded, last_refund_id
@@ -454,7 +505,8 @@ class ReceiptItem(MagModel):
     receipt_id = Column(UUID, ForeignKey('model_receipt.id', ondelete='SET NULL'), nullable=True)
     receipt = relationship('ModelReceipt', foreign_keys=receipt_id,
                            cascade='save-update, merge',
-                           backref=backref('receipt_items', cascade='save-update, merge'))
+                           backref=backref('receipt_items', cascade='save-update, merge',
+                                           order_by='ReceiptItem.added'))
     txn_id = Column(UUID, ForeignKey('receipt_transaction.id', ondelete='SET NULL'), nullable=True)
     receipt_txn = relationship('ReceiptTransaction', foreign_keys=txn_id,
                                cascade='save-update, merge',
@@ -469,7 +521,11 @@ class ReceiptItem(MagModel):
     desc = Column(UnicodeText)
     revert_change = Column(JSON, default={}, server_default='{}')
 
-    @property
+    __table_args__ = (
+        Index('ix_receipt_item_receipt_id_added', receipt_id, added),
+    )
+
+    @hybrid_property
     def total_amount(self):
         return self.amount * self.count
 
@@ -527,7 +583,7 @@ class ReceiptInfo(MagModel):
 class TerminalSettlement(MagModel):
     batch_timestamp = Column(UnicodeText)
     batch_who = Column(UnicodeText)
-    requested = Column(UTCDateTime, default=lambda: datetime.now(UTC))
+    requested = Column(UTCDateTime, server_default=utcnow())
     workstation_num = Column(Integer, default=0)
     terminal_id = Column(UnicodeText)
     response = Column(MutableDict.as_mutable(JSONB), default={})
@@ -11,14 +11,14 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.schema import Column
 from sqlalchemy.sql.expression import FunctionElement
-from sqlalchemy.types import Integer, TypeDecorator
+from sqlalchemy.types import Boolean, Integer, TypeDecorator
 
 from uber.config import c, _config as config
 from uber.utils import url_domain
 
 
 __all__ = [
-    'default_relationship', 'relationship', 'utcmin', 'utcnow', 'Choice',
+    'default_relationship', 'relationship', 'utcmin', 'utcnow', 'has_opt', 'Choice',
     'Column', 'DefaultColumn', 'JSONColumnMixin', 'MultiChoice',
     'SocialMediaMixin', 'TakesPaymentMixin']
 
@@ -172,6 +172,43 @@ def sqlite_utcnow(element, compiler, **kw):
     return "(datetime('now', 'utc'))"
 
 
+class has_opt(FunctionElement):
+    """
+    Tests whether a MultiChoice column contains a single option, e.g.::
+
+        has_opt(Attendee.ribbon, c.PANELIST_RIBBON)
+
+    Filtering with Attendee.ribbon.contains(c.PANELIST_RIBBON) does a
+    LIKE '%...%' scan, which can never use an index and also matches any
+    option whose value merely contains the one we're looking for.
+
+    On postgres this compiles to an array containment check against
+    string_to_array(column, ','), which is served by the GIN expression
+    index we keep on attendee.ribbon.  Every other dialect (including
+    sqlite and plain str() of a query) falls back to matching the
+    comma-delimited value.
+    """
+    type = Boolean()
+    inherit_cache = True
+
+    def __init__(self, column, opt):
+        super().__init__(column, str(opt))
+
+
+@compiles(has_opt, 'postgresql')
+def pg_has_opt(element, compiler, **kw):
+    column, opt = element.clauses
+    return "(string_to_array({}, ',') @> ARRAY[CAST({} AS TEXT)])".format(
+        compiler.process(column, **kw), compiler.process(opt, **kw))
+
+
+@compiles(has_opt)
+def default_has_opt(element, compiler, **kw):
+    column, opt = element.clauses
+    return "(',' || {} || ',' LIKE '%,' || {} || ',%')".format(
+        compiler.process(column, **kw), compiler.process(opt, **kw))
+
+
 class Choice(TypeDecorator):
     """
     Utility class for storing the results of a dropdown as a database column.
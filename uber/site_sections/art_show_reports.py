@@ -2,6 +2,7 @@ from uber.config import c
 from uber.decorators import all_renderable, csv_file, log_pageview
 
 from sqlalchemy import or_, and_
+from sqlalchemy.orm import selectinload
 
 from uber.custom_tags import format_currency
 from uber.models import ArtShowApplication, ArtShowBidder, ArtShowPiece, ArtShowReceipt, Attendee, ModelReceipt
@@ -148,7 +149,9 @@ class Root:
                    ArtShowApplication.status == c.APPROVED]
 
         return {
-            'apps': session.query(ArtShowApplication).join(ArtShowApplication.active_receipt).filter(*filters),
+            'apps': session.query(ArtShowApplication).join(ArtShowApplication.active_receipt).filter(*filters).options(
+                selectinload(ArtShowApplication.active_receipt).selectinload(ModelReceipt.receipt_items),
+                selectinload(ArtShowApplication.active_receipt).selectinload(ModelReceipt.receipt_txns)),
         }
 
     @log_pageview
@@ -164,7 +167,9 @@ class Root:
                     ModelReceipt.current_receipt_amount != 0)
 
         return {
-            'apps': apps.filter(ArtShowApplication.status == c.APPROVED),
+            'apps': apps.filter(ArtShowApplication.status == c.APPROVED).options(
+                selectinload(ArtShowApplication.active_receipt).selectinload(ModelReceipt.receipt_items),
+                selectinload(ArtShowApplication.active_receipt).selectinload(ModelReceipt.receipt_txns)),
             'include_no_receipts': include_no_receipts,
         }
 
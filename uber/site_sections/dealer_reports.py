@@ -1,4 +1,5 @@
 from sqlalchemy import or_, and_
+from sqlalchemy.orm import selectinload
 
 from uber.config import c
 from uber.decorators import all_renderable, csv_file, xlsx_file, log_pageview
@@ -14,7 +15,9 @@ class Root:
                    Group.status == c.APPROVED]
 
         return {
-            'groups': session.query(Group).join(Group.active_receipt).filter(*filters),
+            'groups': session.query(Group).join(Group.active_receipt).filter(*filters).options(
+                selectinload(Group.active_receipt).selectinload(ModelReceipt.receipt_items),
+                selectinload(Group.active_receipt).selectinload(ModelReceipt.receipt_txns)),
         }
 
     @log_pageview
@@ -29,7 +32,9 @@ class Root:
                 ModelReceipt.current_receipt_amount != 0)
 
         return {
-            'groups': groups.filter(Group.is_dealer == True, Group.status == c.APPROVED),  # noqa: E712
+            'groups': groups.filter(Group.is_dealer == True, Group.status == c.APPROVED).options(  # noqa: E712
+                selectinload(Group.active_receipt).selectinload(ModelReceipt.receipt_items),
+                selectinload(Group.active_receipt).selectinload(ModelReceipt.receipt_txns)),
             'include_no_receipts': include_no_receipts,
         }
 
@@ -1,4 +1,5 @@
 from sqlalchemy import or_
+from sqlalchemy.orm import selectinload
 
 from uber.config import c
 from uber.decorators import all_renderable, log_pageview
@@ -44,7 +45,9 @@ class Root:
         else:
             filters.append(Attendee.is_valid == True)  # noqa: E712
 
-        receipt_query = session.query(Attendee).join(Attendee.active_receipt).filter(*filters)
+        receipt_query = session.query(Attendee).join(Attendee.active_receipt).filter(*filters).options(
+            selectinload(Attendee.active_receipt).selectinload(ModelReceipt.receipt_items),
+            selectinload(Attendee.active_receipt).selectinload(ModelReceipt.receipt_txns))
 
         page = int(page)
         if page <= 0:
@@ -61,10 +64,16 @@ class Root:
 
     @log_pageview
     def attendees_nonzero_balance(self, session, include_no_receipts=False):
+        # Fetch the receipt totals alongside each attendee so rendering the page doesn't
+        # lazy-load every receipt's items and transactions
         attendees = session.query(Attendee,
-                                  ModelReceipt).join(Attendee.active_receipt
-                                                     ).filter(Attendee.default_cost_cents == ModelReceipt.item_total,
-                                                              ModelReceipt.current_receipt_amount != 0)
+                                  ModelReceipt.item_total,
+                                  ModelReceipt.payment_total,
+                                  ModelReceipt.refund_total,
+                                  ModelReceipt.txn_total
+                                  ).join(Attendee.active_receipt
+                                         ).filter(Attendee.default_cost_cents == ModelReceipt.item_total,
+                                                  ModelReceipt.current_receipt_amount != 0)
 
         return {
             'attendees': attendees.filter(Attendee.is_valid == True)  # noqa: E712
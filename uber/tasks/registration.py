@@ -14,6 +14,7 @@ from uber.config import c
 from uber.custom_tags import readable_join
 from uber.decorators import render
 from uber.models import ApiJob, Attendee, TerminalSettlement, Email, Session, ReceiptInfo, ReceiptTransaction
+from uber.models.types import has_opt
 from uber.tasks.email import send_email
 from uber.tasks import celery
 from uber.utils import localized_now, TaskUtils
@@ -74,7 +75,7 @@ def check_placeholder_registrations():
         ], [
             'Panelist',
             c.PANELS_EMAIL,
-            or_(Attendee.badge_type == c.GUEST_BADGE, Attendee.ribbon.contains(c.PANELIST_RIBBON)),
+            or_(Attendee.badge_type == c.GUEST_BADGE, has_opt(Attendee.ribbon, c.PANELIST_RIBBON)),
             Attendee.is_valid == True  # noqa: E712
         ], [
             'Attendee',
@@ -82,7 +83,7 @@ def check_placeholder_registrations():
             not_(or_(
                 Attendee.staffing == True,  # noqa: E712
                 Attendee.badge_type == c.GUEST_BADGE,
-                Attendee.ribbon.contains(c.PANELIST_RIBBON))),
+                has_opt(Attendee.ribbon, c.PANELIST_RIBBON))),
             Attendee.is_valid == True  # noqa: E712
         ]]
 
@@ -636,7 +636,8 @@ def validate_model(forms, model, preview_model=None, is_admin=False):
 
     for form in forms.values():
         extra_validators = defaultdict(list)
-        for field_name in form.get_optional_fields(preview_model, is_admin):
+        # Forms can list the same field more than once, e.g., via copy_address and AddressForm
+        for field_name in set(form.get_optional_fields(preview_model, is_admin)):
             field = getattr(form, field_name)
             if field:
                 field.validators = (